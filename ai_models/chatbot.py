@@ -1,12 +1,12 @@
 # backend/ai_models/chatbot.py
 
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import AsyncOpenAI
 import os
 
 # Initialize router
 # Connect to local Ollama server
-client = OpenAI(
+client = AsyncOpenAI(
     base_url=os.getenv("base_url"),
     api_key="ollama",  # required but not used by Ollama
 )
@@ -32,16 +32,13 @@ async def chat( user_message:str):
     """
     Send a user message to the AI tutor and return the assistant's reply.
     """
-    try:
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message}
-        ]
-        response = client.chat.completions.create(
-            model="llama3.1:latest",
-            messages=messages
-        )
-        assistant_reply = response.choices[0].message["content"]
-        return ChatResponse(reply=assistant_reply)
-    except Exception as e:
-        pass
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_message}
+    ]
+    response = await client.chat.completions.create(
+        model="llama3.1:latest",
+        messages=messages
+    )
+    assistant_reply = response.choices[0].message.content
+    return ChatResponse(reply=assistant_reply)
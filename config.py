@@ -0,0 +1,19 @@
+# Central configuration: the environment is loaded and read exactly once here
+# so every module shares the same constants instead of repeating load_dotenv()
+# and os.getenv() at import time.
+
+import os
+from typing import Final, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# OpenWeatherMap API key (kept under the existing "api_key" env name)
+WEATHER_API_KEY: Final[Optional[str]] = os.getenv("api_key")
+if not WEATHER_API_KEY:
+    print("Warning: api_key is not set; OpenWeatherMap requests will fail")
+
+# Base URL of the OpenAI-compatible LLM endpoint
+OLLAMA_BASE_URL: Final[Optional[str]] = os.getenv("base_url")
+if not OLLAMA_BASE_URL:
+    print("Warning: base_url is not set; AI responses will use fallbacks")
@@ -1,22 +1,55 @@
 # weather_agent.py
 
-import os
-import requests
-from typing import Annotated
+import asyncio
+import aiohttp
+import orjson
+from cachetools import TTLCache
+from typing import Annotated, Optional
 from langchain_core.tools import tool
-from dotenv import load_dotenv
-load_dotenv()
+from config import WEATHER_API_KEY as OWM_API_KEY
 
-def fetch_weather(city: str) -> dict:
+# Pre-build the constant part of the request URL (the key itself is resolved
+# once in config.py)
+_OWM_URL = f"http://api.openweathermap.org/data/2.5/weather?appid={OWM_API_KEY}&units=metric&q="
+
+# Strips surrounding quotes in one pass (each .strip() call is a full scan
+# plus a new string)
+_CITY_STRIP = str.maketrans("", "", "\"'")
+
+# Successful responses cached per city for 10 minutes - well within how often
+# OpenWeatherMap refreshes its observations
+_WEATHER_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+# Shared HTTP session so the event loop isn't blocked and connections are reused
+_http_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
+    return _http_session
+
+async def close_session():
+    """Close the shared HTTP session (called on application shutdown)"""
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
+async def fetch_weather(city: str) -> dict:
     """Fetch weather information for a given city."""
-    api_key = os.getenv("api_key")
-    city = city.strip().strip('"').strip("'")
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
+    city = city.translate(_CITY_STRIP).strip()
+    cache_key = city.lower()
+    cached = _WEATHER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    url = _OWM_URL + city
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return {"status": "success",
+        session = _get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
+        result = {"status": "success",
         "data": {
             "weather": data['weather'][0]['description'].title(),
             "temperature": f"{data['main']['temp']}°C",
@@ -24,8 +57,12 @@ def fetch_weather(city: str) -> dict:
             "wind_speed": f"{data['wind']['speed']} m/s",
         }
     }
-        
-    except requests.RequestException as e:
+        _WEATHER_CACHE[cache_key] = result
+        return result
+
+    # aiohttp raises asyncio.TimeoutError (not a ClientError) when the
+    # ClientTimeout budget is exceeded, so it needs its own clause here
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         return {"error": f"Error fetching weather for {city}: {str(e)}"}
     except KeyError as e:
-        return {"error": f"Error parsing weather data for {city}: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Error parsing weather data for {city}: {str(e)}"}
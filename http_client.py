@@ -0,0 +1,23 @@
+# Shared HTTP client for OpenWeatherMap calls
+
+import httpx
+from typing import Optional
+
+# One process-wide client so keep-alive connections (and the TLS handshake)
+# are amortized across requests instead of paid per call
+_owm_client: Optional[httpx.AsyncClient] = None
+
+def get_owm_client() -> httpx.AsyncClient:
+    """Return the shared OpenWeatherMap client, creating it on first use"""
+    global _owm_client
+    if _owm_client is None or _owm_client.is_closed:
+        _owm_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _owm_client
+
+async def close_owm_client():
+    """Close the shared client (called on application shutdown)"""
+    if _owm_client is not None and not _owm_client.is_closed:
+        await _owm_client.aclose()
@@ -1,23 +1,77 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import MutableHeaders
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Import routers
+import routes.chatbot as chatbot
+import data_processing.weather as weather_agent
+from http_client import get_owm_client, close_owm_client
 from routes.chatbot import router as chatbot_router
 from routes.weather import router as weather_router
 from routes.dashboard import router as dashboard_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the pooled HTTP sessions once on the running event loop and
+    # share them for the life of the process; per-request clients would
+    # pay a TCP handshake every call and misbehave under concurrency
+    app.state.llm_http = chatbot._get_session()
+    app.state.weather_http = weather_agent._get_session()
+    app.state.owm_http = get_owm_client()
+    yield
+    await chatbot.close_session()
+    await weather_agent.close_session()
+    await close_owm_client()
+
 # Create FastAPI app
 app = FastAPI(
     title="ClimateBuddy API",
     description="AI-powered climate science tutor with interactive dashboard",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+class SSEIdentityEncoding:
+    """Mark text/event-stream responses so GZipMiddleware passes them through.
+
+    GZipMiddleware buffers streamed chunks in a GzipFile without flushing, so
+    a gzipped SSE stream delivers ~nothing until it closes - time-to-first-
+    token degrades to full generation time. Stamping Content-Encoding:
+    identity on SSE response starts makes the gzip responder skip them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if headers.get("content-type", "").startswith("text/event-stream"):
+                    headers.setdefault("content-encoding", "identity")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+# Compress large responses - the dashboard payload is 20-40 KB of highly
+# repetitive JSON that gzips 5-10x; level 5 keeps CPU cost modest. The SSE
+# exemption is added first so it sits inside gzip and stamps the header
+# before the gzip responder inspects it.
+app.add_middleware(SSEIdentityEncoding)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -52,6 +106,9 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=False,  # the reload watcher forks a process and costs throughput
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
         log_level="info"
     )
@@ -1,35 +1,116 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from openai import OpenAI
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+import aiohttp
+import asyncio
+import functools
+import hashlib
+import orjson
 import os
+from cachetools import TTLCache
+from types import MappingProxyType
 from typing import Optional
-from dotenv import load_dotenv
-load_dotenv()
+from config import OLLAMA_BASE_URL
 
 router = APIRouter()
 
-# Initialize OpenAI client
-try:
-    client = OpenAI(
-        base_url=os.getenv("base_url"),
-        api_key="ollama",  # required but not used by Ollama
-    )
-except Exception as e:
-    print(f"Warning: Could not initialize OpenAI client: {e}")
-    client = None
+# Ollama exposes an OpenAI-compatible API; we POST to it directly with aiohttp
+# instead of going through the OpenAI SDK (httpx + pydantic response models add
+# measurable per-request overhead under concurrency)
+
+# In-process TTL caches keyed by request content; a cache hit skips the whole
+# Ollama round-trip. /explain has a tiny key space (topic, age, level) so hit
+# rates are high; repeated chat prompts are shorter-lived
+_EXPLAIN_CACHE = TTLCache(maxsize=2048, ttl=3600)
+_CHAT_CACHE = TTLCache(maxsize=4096, ttl=600)
+
+# Single-flight map: concurrent identical /explain requests share one LLM call
+# instead of each issuing their own before the cache populates
+_INFLIGHT: dict = {}
+
+def _cache_key(*parts) -> bytes:
+    """Deterministic cache key over the request fields that shape the reply"""
+    return hashlib.blake2b(orjson.dumps(parts)).digest()
+
+# Cap the number of in-flight LLM requests so bursts don't oversubscribe
+# Ollama and collapse throughput / inflate tail latency
+LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "4")))
+
+# Shared HTTP session for all LLM calls (created lazily on the running loop)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=256),
+            timeout=aiohttp.ClientTimeout(total=120)
+        )
+    return _http_session
+
+async def close_session():
+    """Close the shared HTTP session (called on application shutdown)"""
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
+async def _llm_complete(messages: list, temperature: float = 0.7, max_tokens: int = 500) -> str:
+    """Call the chat completions endpoint directly and return the reply text"""
+    session = _get_session()
+    payload = {
+        "model": "llama3.1:latest",
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    async with LLM_SEMAPHORE:
+        async with session.post(f"{OLLAMA_BASE_URL}/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
+    return data["choices"][0]["message"]["content"]
+
+async def _llm_stream(messages: list, temperature: float = 0.7, max_tokens: int = 500):
+    """Stream completion deltas from the chat completions endpoint as they arrive"""
+    session = _get_session()
+    payload = {
+        "model": "llama3.1:latest",
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+    async with LLM_SEMAPHORE:
+        async with session.post(f"{OLLAMA_BASE_URL}/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == b"[DONE]":
+                    break
+                delta = orjson.loads(chunk)["choices"][0]["delta"].get("content")
+                if delta:
+                    yield delta
 
 # Request models
 class ChatRequest(BaseModel):
+    # Frozen + extra='forbid' keeps pydantic on its fast path and rejects
+    # unexpected fields instead of silently carrying them
+    model_config = ConfigDict(extra='forbid', frozen=True, str_strip_whitespace=True)
+
     user_message: str
     age_group: Optional[str] = "general"
     knowledge_level: Optional[str] = "beginner"
     language: Optional[str] = "english"
     subject: Optional[str] = "climate_science"
     location: Optional[str] = None
+    stream: Optional[bool] = False
 
 class ChatResponse(BaseModel):
     reply: str
-    suggested_topics: list[str] = []
+    # Immutable default avoids pydantic deep-copying a shared mutable list
+    # on every response
+    suggested_topics: tuple[str, ...] = ()
 
 # Enhanced system prompt for climate tutor
 SYSTEM_PROMPT = """
@@ -70,6 +151,63 @@ CLIMATE_TOPICS = [
     "Climate Solutions"
 ]
 
+# Keyword -> suggested-topics map used for topic suggestions (frozen: built
+# once at import, never mutated or re-allocated per call)
+TOPIC_KEYWORDS = MappingProxyType({
+    "greenhouse": ("Carbon Footprint", "Renewable Energy"),
+    "carbon": ("Greenhouse Effect", "Carbon Footprint"),
+    "energy": ("Renewable Energy", "Sustainable Living"),
+    "ocean": ("Ocean Acidification", "Biodiversity Loss"),
+    "weather": ("Weather vs Climate", "Climate Adaptation"),
+    "tree": ("Deforestation", "Biodiversity Loss"),
+    "sustainable": ("Sustainable Living", "Climate Solutions"),
+    "biodiversity": ("Biodiversity Loss", "Deforestation"),
+    "adaptation": ("Climate Adaptation", "Climate Solutions")
+})
+
+# Related-topics lookup with pre-normalized (lowercased) keys
+_RELATED_MAP = MappingProxyType({
+    "greenhouse effect": ("Carbon Footprint", "Climate Solutions"),
+    "carbon footprint": ("Greenhouse Effect", "Sustainable Living"),
+    "renewable energy": ("Climate Solutions", "Sustainable Living"),
+    "ocean acidification": ("Biodiversity Loss", "Climate Adaptation"),
+    "deforestation": ("Biodiversity Loss", "Carbon Footprint"),
+    "climate adaptation": ("Climate Solutions", "Weather vs Climate"),
+    "weather vs climate": ("Climate Adaptation", "Greenhouse Effect"),
+    "biodiversity loss": ("Deforestation", "Ocean Acidification"),
+    "sustainable living": ("Carbon Footprint", "Renewable Energy"),
+    "climate solutions": ("Renewable Energy", "Sustainable Living")
+})
+
+_DEFAULT_TOPICS = ("Greenhouse Effect", "Renewable Energy", "Sustainable Living")
+
+# Compile the keywords into an Aho-Corasick automaton once at import so topic
+# suggestion is a single linear pass over the message instead of one substring
+# scan per keyword. Falls back to plain scans if pyahocorasick is unavailable.
+try:
+    import ahocorasick
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _topics in TOPIC_KEYWORDS.items():
+        _KEYWORD_AUTOMATON.add_word(_keyword, _topics)
+    _KEYWORD_AUTOMATON.make_automaton()
+except ImportError:
+    _KEYWORD_AUTOMATON = None
+
+# Optional Hyperscan tier on top of Aho-Corasick: a SIMD-accelerated
+# multi-pattern matcher that wins on long messages. Purely opt-in since the
+# package only builds on x86 platforms with the Hyperscan library present.
+try:
+    import hyperscan
+    _KEYWORD_LIST = tuple(TOPIC_KEYWORDS)
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[keyword.encode() for keyword in _KEYWORD_LIST],
+        ids=list(range(len(_KEYWORD_LIST))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_KEYWORD_LIST)
+    )
+except ImportError:
+    _HS_DB = None
+
 # Available subjects for the AI tutor
 AVAILABLE_SUBJECTS = {
     "climate_science": {
@@ -99,61 +237,151 @@ AVAILABLE_SUBJECTS = {
     }
 }
 
+# The topic/subject payloads never change, so serialize them once at import
+# and serve the cached bytes instead of re-encoding per request
+_TOPICS_JSON = orjson.dumps({"topics": CLIMATE_TOPICS})
+_SUBJECTS_JSON = orjson.dumps({"subjects": AVAILABLE_SUBJECTS})
+_SUBJECT_TOPICS_JSON = {
+    subject_id: orjson.dumps({"subject": subject, "topics": subject["topics"]})
+    for subject_id, subject in AVAILABLE_SUBJECTS.items()
+}
+
+# Micro-batching: requests landing within a short window are dispatched to
+# Ollama together so its scheduler can batch them into a shared forward pass
+LLM_MAX_BATCH = int(os.getenv("LLM_MAX_BATCH", "8"))
+LLM_BATCH_WINDOW = float(os.getenv("LLM_BATCH_WINDOW", "0.01"))
+
+class BatchedLLM:
+    """Collects concurrent completion requests and submits them as one burst.
+
+    The OpenAI-compatible endpoint takes one prompt per request, so a drained
+    batch is dispatched as simultaneous requests; server-side continuous
+    batching then shares the forward pass across them.
+    """
+
+    def __init__(self, max_batch: int = LLM_MAX_BATCH, window: float = LLM_BATCH_WINDOW):
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def submit(self, messages: list, temperature: float = 0.7, max_tokens: int = 500) -> str:
+        loop = asyncio.get_running_loop()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = loop.create_task(self._consume())
+        future = loop.create_future()
+        await self._queue.put((messages, temperature, max_tokens, future))
+        return await future
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Fire-and-forget: awaiting the batch here would head-of-line
+            # block later arrivals behind the slowest generation in this one.
+            # LLM_SEMAPHORE already bounds in-flight requests, and _dispatch
+            # resolves each caller's future itself, so the consumer can go
+            # straight back to draining the queue.
+            for item in batch:
+                loop.create_task(self._dispatch(item))
+
+    @staticmethod
+    async def _dispatch(item):
+        messages, temperature, max_tokens, future = item
+        try:
+            reply = await _llm_complete(messages, temperature=temperature, max_tokens=max_tokens)
+            if not future.done():
+                future.set_result(reply)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+LLM_BATCHER = BatchedLLM()
+
+@functools.lru_cache(maxsize=512)
+def _build_prompt(age_group: Optional[str], knowledge_level: Optional[str],
+                  language: Optional[str], subject: Optional[str],
+                  location: Optional[str]) -> str:
+    """Build the personalized system prompt; memoized since the profile space is small"""
+    location_context = f"\n- User Location: {location}" if location else ""
+    return f"{SYSTEM_PROMPT}\n\nUser Profile:\n- Age Group: {age_group}\n- Knowledge Level: {knowledge_level}\n- Language: {language}\n- Subject Focus: {subject}{location_context}\n\nPlease adapt your response accordingly and focus on the {subject} subject area."
+
 @router.post("/", response_model=ChatResponse)
-async def chat_with_tutor(request: ChatRequest):
+async def chat_with_tutor(raw: Request):
     """
     Chat with the AI climate tutor
     """
+    # Validate the raw body in one pass (jiter) instead of FastAPI's
+    # json.loads -> dict -> model_validate double materialization
     try:
-        if client is None:
-            # Fallback response when AI client is not available
-            fallback_response = f"""
-            Hello! I'm ClimateBuddy, your AI climate science tutor. I'm here to help you understand climate science concepts in simple terms.
-            
-            You asked: "{request.user_message}"
-            
-            While I'm currently experiencing some technical difficulties with my AI system, I can still help you learn about climate science! Here are some key concepts related to your question:
-            
-            🌍 Climate vs Weather: Climate is the long-term pattern of weather in a specific area, while weather is what you see day-to-day.
-            
-            🌡️ Greenhouse Effect: This is how Earth stays warm enough for life. Certain gases in our atmosphere trap heat from the sun.
-            
-            💡 What you can do: Start by learning about your carbon footprint and how small changes in daily habits can make a big difference!
-            
-            Please try again in a few moments, or explore our interactive dashboard to learn more about climate data!
-            """
-            
-            return ChatResponse(
-                reply=fallback_response,
-                suggested_topics=["Greenhouse Effect", "Carbon Footprint", "Climate vs Weather"]
-            )
-        
+        request = ChatRequest.model_validate_json(await raw.body())
+    except ValidationError as e:
+        # include_input=False: on a json_invalid failure the error's input is
+        # the raw bytes body, which the default exception handler's json.dumps
+        # cannot encode (bytes -> TypeError -> 500 instead of 422)
+        raise HTTPException(status_code=422, detail=e.errors(include_input=False))
+
+    try:
+        if not OLLAMA_BASE_URL:
+            # Fallback response when AI backend is not configured
+            return Response(content=_FALLBACK_CHAT_JSON, media_type="application/json")
+
+        cache_key = _cache_key(
+            request.user_message, request.age_group, request.knowledge_level,
+            request.language, request.subject, request.location
+        )
+        cached = _CHAT_CACHE.get(cache_key)
+        if cached is not None and not request.stream:
+            return cached
+
         # Customize system prompt based on user preferences
-        location_context = f"\n- User Location: {request.location}" if request.location else ""
-        personalized_prompt = f"{SYSTEM_PROMPT}\n\nUser Profile:\n- Age Group: {request.age_group}\n- Knowledge Level: {request.knowledge_level}\n- Language: {request.language}\n- Subject Focus: {request.subject}{location_context}\n\nPlease adapt your response accordingly and focus on the {request.subject} subject area."
-        
+        personalized_prompt = _build_prompt(
+            request.age_group, request.knowledge_level,
+            request.language, request.subject, request.location
+        )
+
         messages = [
             {"role": "system", "content": personalized_prompt},
             {"role": "user", "content": request.user_message}
         ]
-        
-        response = client.chat.completions.create(
-            model="llama3.1:latest",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=500
+
+        if request.stream:
+            # Stream tokens as server-sent events so the user sees output
+            # immediately instead of waiting for the full generation
+            suggested_topics = generate_suggested_topics(request.user_message)
+
+            async def event_stream():
+                async for token in _llm_stream(messages, temperature=0.7, max_tokens=500):
+                    yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+                yield f"data: {orjson.dumps({'suggested_topics': suggested_topics}).decode()}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        # Kick off the LLM call first, then compute suggested topics while it
+        # is in flight instead of serializing the keyword scan behind it
+        llm_task = asyncio.create_task(
+            LLM_BATCHER.submit(messages, temperature=0.7, max_tokens=500)
         )
-        
-        assistant_reply = response.choices[0].message.content
-        
-        # Generate suggested topics based on the conversation
         suggested_topics = generate_suggested_topics(request.user_message)
-        
-        return ChatResponse(
+        assistant_reply = await llm_task
+
+        chat_response = ChatResponse(
             reply=assistant_reply,
             suggested_topics=suggested_topics
         )
-        
+        _CHAT_CACHE[cache_key] = chat_response
+        return chat_response
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
 
@@ -162,27 +390,25 @@ async def get_climate_topics():
     """
     Get list of available climate science topics
     """
-    return {"topics": CLIMATE_TOPICS}
+    return Response(content=_TOPICS_JSON, media_type="application/json")
 
 @router.get("/subjects")
 async def get_available_subjects():
     """
     Get list of available subjects for the AI tutor
     """
-    return {"subjects": AVAILABLE_SUBJECTS}
+    return Response(content=_SUBJECTS_JSON, media_type="application/json")
 
 @router.get("/subjects/{subject_id}/topics")
 async def get_subject_topics(subject_id: str):
     """
     Get topics for a specific subject
     """
-    if subject_id not in AVAILABLE_SUBJECTS:
+    cached = _SUBJECT_TOPICS_JSON.get(subject_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail=f"Subject '{subject_id}' not found")
-    
-    return {
-        "subject": AVAILABLE_SUBJECTS[subject_id],
-        "topics": AVAILABLE_SUBJECTS[subject_id]["topics"]
-    }
+
+    return Response(content=cached, media_type="application/json")
 
 @router.get("/explain/{topic}")
 async def explain_topic(topic: str, age_group: str = "general", knowledge_level: str = "beginner"):
@@ -190,45 +416,58 @@ async def explain_topic(topic: str, age_group: str = "general", knowledge_level:
     Get a detailed explanation of a specific climate topic
     """
     try:
-        if client is None:
-            # Fallback explanation when AI client is not available
-            fallback_explanations = {
-                "greenhouse effect": "The greenhouse effect is like a blanket around Earth. Just like a blanket keeps you warm at night, certain gases in our atmosphere trap heat from the sun, keeping our planet warm enough for life to exist.",
-                "carbon footprint": "Your carbon footprint is like a trail you leave behind. It's the total amount of greenhouse gases (especially carbon dioxide) that your activities produce. Everything from driving a car to using electricity adds to your footprint.",
-                "renewable energy": "Renewable energy comes from sources that never run out, like sunlight, wind, and water. Unlike fossil fuels (coal, oil, gas) that take millions of years to form, renewable energy sources are constantly being replenished by nature.",
-                "climate change": "Climate change refers to long-term changes in global temperatures and weather patterns. While climate naturally varies, human activities since the 1800s have been the main driver of climate change, primarily due to burning fossil fuels."
-            }
-            
-            explanation = fallback_explanations.get(topic.lower(), f"Climate science is fascinating! {topic} is an important concept in understanding how our planet works. While I'm experiencing technical difficulties, I encourage you to explore our interactive dashboard to learn more about climate data and trends.")
-            
+        if not OLLAMA_BASE_URL:
+            # Fallback explanation when AI backend is not configured; known
+            # topics are served from pre-encoded bytes
+            cached = _FALLBACK_EXPLAIN_JSON.get(topic.lower())
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+
             return {
+                "topic": topic,
+                "explanation": f"Climate science is fascinating! {topic} is an important concept in understanding how our planet works. While I'm experiencing technical difficulties, I encourage you to explore our interactive dashboard to learn more about climate data and trends.",
+                "related_topics": get_related_topics(topic)
+            }
+
+        cache_key = _cache_key(topic, age_group, knowledge_level)
+        cached = _EXPLAIN_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Join an identical request that is already in flight
+        inflight = _INFLIGHT.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[cache_key] = future
+        try:
+            prompt = f"Explain '{topic}' in climate science. Age group: {age_group}, Knowledge level: {knowledge_level}. Make it engaging and include practical examples."
+
+            messages = [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+
+            explanation = await LLM_BATCHER.submit(messages, temperature=0.7, max_tokens=600)
+
+            result = {
                 "topic": topic,
                 "explanation": explanation,
                 "related_topics": get_related_topics(topic)
             }
-        
-        prompt = f"Explain '{topic}' in climate science. Age group: {age_group}, Knowledge level: {knowledge_level}. Make it engaging and include practical examples."
-        
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": prompt}
-        ]
-        
-        response = client.chat.completions.create(
-            model="llama3.1:latest",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=600
-        )
-        
-        explanation = response.choices[0].message.content
-        
-        return {
-            "topic": topic,
-            "explanation": explanation,
-            "related_topics": get_related_topics(topic)
-        }
-        
+            _EXPLAIN_CACHE[cache_key] = result
+            future.set_result(result)
+            return result
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved in case no duplicate request is waiting
+                future.exception()
+            raise
+        finally:
+            _INFLIGHT.pop(cache_key, None)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error explaining topic: {str(e)}")
 
@@ -238,48 +477,76 @@ def generate_suggested_topics(user_message: str) -> list[str]:
     """
     message_lower = user_message.lower()
     suggestions = []
-    
-    # Simple keyword matching for topic suggestions
-    topic_keywords = {
-        "greenhouse": ["Carbon Footprint", "Renewable Energy"],
-        "carbon": ["Greenhouse Effect", "Carbon Footprint"],
-        "energy": ["Renewable Energy", "Sustainable Living"],
-        "ocean": ["Ocean Acidification", "Biodiversity Loss"],
-        "weather": ["Weather vs Climate", "Climate Adaptation"],
-        "tree": ["Deforestation", "Biodiversity Loss"],
-        "sustainable": ["Sustainable Living", "Climate Solutions"],
-        "biodiversity": ["Biodiversity Loss", "Deforestation"],
-        "adaptation": ["Climate Adaptation", "Climate Solutions"]
-    }
-    
-    for keyword, topics in topic_keywords.items():
-        if keyword in message_lower:
+
+    if _HS_DB is not None:
+        # Vectorized scan; each keyword id is reported at most once
+        matched_ids = []
+        _HS_DB.scan(
+            message_lower.encode(),
+            match_event_handler=lambda pat_id, start, end, flags, ctx: matched_ids.append(pat_id)
+        )
+        for pat_id in sorted(matched_ids):
+            suggestions.extend(TOPIC_KEYWORDS[_KEYWORD_LIST[pat_id]])
+    elif _KEYWORD_AUTOMATON is not None:
+        # Single linear pass over the message for all keywords at once
+        for _, topics in _KEYWORD_AUTOMATON.iter(message_lower):
             suggestions.extend(topics)
-    
-    # Remove duplicates and limit to 3 suggestions
-    suggestions = list(set(suggestions))[:3]
-    
+    else:
+        # Fallback: one substring scan per keyword
+        for keyword, topics in TOPIC_KEYWORDS.items():
+            if keyword in message_lower:
+                suggestions.extend(topics)
+
+    # Remove duplicates (order-preserving, so results are deterministic)
+    # and limit to 3 suggestions
+    suggestions = list(dict.fromkeys(suggestions))[:3]
+
     # If no specific matches, return general topics
     if not suggestions:
-        suggestions = ["Greenhouse Effect", "Renewable Energy", "Sustainable Living"]
-    
+        suggestions = list(_DEFAULT_TOPICS)
+
     return suggestions
 
 def get_related_topics(topic: str) -> list[str]:
     """
     Get related topics for a given climate topic
     """
-    related_map = {
-        "greenhouse effect": ["Carbon Footprint", "Climate Solutions"],
-        "carbon footprint": ["Greenhouse Effect", "Sustainable Living"],
-        "renewable energy": ["Climate Solutions", "Sustainable Living"],
-        "ocean acidification": ["Biodiversity Loss", "Climate Adaptation"],
-        "deforestation": ["Biodiversity Loss", "Carbon Footprint"],
-        "climate adaptation": ["Climate Solutions", "Weather vs Climate"],
-        "weather vs climate": ["Climate Adaptation", "Greenhouse Effect"],
-        "biodiversity loss": ["Deforestation", "Ocean Acidification"],
-        "sustainable living": ["Carbon Footprint", "Renewable Energy"],
-        "climate solutions": ["Renewable Energy", "Sustainable Living"]
-    }
-    
-    return related_map.get(topic.lower(), ["Greenhouse Effect", "Renewable Energy", "Sustainable Living"])
+    return list(_RELATED_MAP.get(topic.lower(), _DEFAULT_TOPICS))
+
+# Fallback payloads served when no AI backend is configured. They are
+# constants, so encode them once at import instead of rebuilding and
+# re-serializing on every request.
+_FALLBACK_CHAT_TEXT = """
+            Hello! I'm ClimateBuddy, your AI climate science tutor. I'm here to help you understand climate science concepts in simple terms.
+            
+            While I'm currently experiencing some technical difficulties with my AI system, I can still help you learn about climate science! Here are some key concepts to get you started:
+            
+            🌍 Climate vs Weather: Climate is the long-term pattern of weather in a specific area, while weather is what you see day-to-day.
+            
+            🌡️ Greenhouse Effect: This is how Earth stays warm enough for life. Certain gases in our atmosphere trap heat from the sun.
+            
+            💡 What you can do: Start by learning about your carbon footprint and how small changes in daily habits can make a big difference!
+            
+            Please try again in a few moments, or explore our interactive dashboard to learn more about climate data!
+            """
+
+_FALLBACK_CHAT_JSON = orjson.dumps({
+    "reply": _FALLBACK_CHAT_TEXT,
+    "suggested_topics": ["Greenhouse Effect", "Carbon Footprint", "Climate vs Weather"]
+})
+
+FALLBACK_EXPLANATIONS = {
+    "greenhouse effect": "The greenhouse effect is like a blanket around Earth. Just like a blanket keeps you warm at night, certain gases in our atmosphere trap heat from the sun, keeping our planet warm enough for life to exist.",
+    "carbon footprint": "Your carbon footprint is like a trail you leave behind. It's the total amount of greenhouse gases (especially carbon dioxide) that your activities produce. Everything from driving a car to using electricity adds to your footprint.",
+    "renewable energy": "Renewable energy comes from sources that never run out, like sunlight, wind, and water. Unlike fossil fuels (coal, oil, gas) that take millions of years to form, renewable energy sources are constantly being replenished by nature.",
+    "climate change": "Climate change refers to long-term changes in global temperatures and weather patterns. While climate naturally varies, human activities since the 1800s have been the main driver of climate change, primarily due to burning fossil fuels."
+}
+
+_FALLBACK_EXPLAIN_JSON = {
+    fallback_topic: orjson.dumps({
+        "topic": fallback_topic,
+        "explanation": explanation,
+        "related_topics": get_related_topics(fallback_topic)
+    })
+    for fallback_topic, explanation in FALLBACK_EXPLANATIONS.items()
+}
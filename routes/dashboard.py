@@ -1,13 +1,19 @@
-import os
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import requests
+import asyncio
+import bisect
+import httpx
 import json
-import random
+import numpy as np
+import orjson
 import datetime
+from cachetools import TTLCache
+from collections import Counter
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
-load_dotenv()
+from http_client import get_owm_client
+from config import WEATHER_API_KEY
 # Chart generation is now handled in the frontend
 
 router = APIRouter()
@@ -16,73 +22,173 @@ router = APIRouter()
 class DashboardDataResponse(BaseModel):
     city: str
     current_weather: Dict[str, Any]
-    summary_stats: Dict[str, str]
+    summary_stats: Dict[str, Any]
     chart_data: Dict[str, Any]  # Raw data for charts
     air_quality: Dict[str, Any]
     forecast: List[Dict[str, Any]]
 
 # ChartData model removed - charts are now generated in frontend
 
-# OpenWeatherMap API configuration
-WEATHER_API_KEY =os.getenv("api_key")
+# Numeric dashboard fields are returned as raw numbers; the frontend applies
+# these display units. Formatting them server-side doubled the string work
+# and inflated the payload.
+_WEATHER_UNITS = {
+    "temperature": "°C",
+    "feels_like": "°C",
+    "humidity": "%",
+    "pressure": "hPa",
+    "wind_speed": "m/s",
+    "wind_direction": "°",
+    "visibility": "km"
+}
+
+# OpenWeatherMap API configuration (key comes from config.py)
 WEATHER_BASE_URL = "http://api.openweathermap.org/data/2.5"
 
-def get_weather_data(city: str) -> Dict[str, Any]:
-    """Fetch current weather data from OpenWeatherMap API"""
+# Query params shared by every data/2.5 call; httpx handles URL escaping, so
+# city names with spaces or accents ("São Paulo") are encoded correctly
+_COMMON_PARAMS = {"appid": WEATHER_API_KEY, "units": "metric"}
+
+# Short-TTL caches keyed by lowercased city so steady-state traffic becomes a
+# dict lookup instead of an upstream round-trip (and we stay inside the
+# OpenWeatherMap free-tier rate limit). Air quality moves faster than weather,
+# so it gets a shorter TTL; geocoding results barely change at all.
+_WEATHER_CACHE = TTLCache(maxsize=512, ttl=600)
+_FORECAST_CACHE = TTLCache(maxsize=512, ttl=600)
+_AIR_QUALITY_CACHE = TTLCache(maxsize=512, ttl=60)
+_CITY_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=3600)
+
+# Shared generator for mock fallback data; one vectorized draw replaces the
+# per-value CPython random calls the fallbacks used to make
+_RNG = np.random.default_rng()
+
+def _mock_air_quality() -> Dict[str, Any]:
+    """Mock air-quality payload used when the OWM API is unavailable"""
+    keys = ("co", "no", "no2", "o3", "so2", "pm2_5", "pm10", "nh3")
+    lows = (200, 0, 10, 50, 5, 10, 20, 0)
+    highs = (1000, 50, 60, 120, 30, 50, 80, 20)
+    return {
+        "list": [{
+            "main": {"aqi": int(_RNG.integers(20, 151))},
+            "components": dict(zip(keys, _RNG.uniform(lows, highs).tolist()))
+        }]
+    }
+
+# City coordinates never move, so geocoding results are cached for the life
+# of the process; a warm entry turns air-quality lookups into a single request
+_CITY_COORDS: Dict[str, tuple] = {}
+
+# In-flight request map: concurrent requests for the same key share a single
+# upstream call instead of racing to populate the cache (dashboard refreshes
+# across many tabs would otherwise multiply upstream QPS)
+_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+async def _single_flight(kind: str, key, fetch):
+    """Run fetch() once per (kind, key); concurrent callers await the same result"""
+    flight_key = (kind, key)
+    future = _INFLIGHT.get(flight_key)
+    if future is not None:
+        return await future
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[flight_key] = future
     try:
-        url = f"{WEATHER_BASE_URL}/weather?q={city}&appid={WEATHER_API_KEY}&units=metric"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Error fetching weather for {city}: {str(e)}")
+        result = await fetch()
+        future.set_result(result)
+        return result
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+            # Mark retrieved in case no duplicate caller is waiting
+            future.exception()
+        raise
+    finally:
+        _INFLIGHT.pop(flight_key, None)
+
+@lru_cache(maxsize=64)
+def _title_case(description: str) -> str:
+    """Memoized str.title(); OWM only emits a few dozen condition strings"""
+    return description.title()
+
+async def get_weather_data(city: str) -> Dict[str, Any]:
+    """Fetch current weather data from OpenWeatherMap API"""
+    cache_key = city.strip().lower()
+    cached = _WEATHER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        try:
+            response = await get_owm_client().get(
+                f"{WEATHER_BASE_URL}/weather", params={**_COMMON_PARAMS, "q": city}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            _WEATHER_CACHE[cache_key] = data
+            coord = data.get('coord')
+            if coord:
+                _CITY_COORDS[cache_key] = (coord['lat'], coord['lon'])
+            return data
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=400, detail=f"Error fetching weather for {city}: {str(e)}")
 
-def get_forecast_data(city: str, days: int = 5) -> Dict[str, Any]:
+    return await _single_flight("weather", cache_key, fetch)
+
+async def get_forecast_data(city: str, days: int = 5) -> Dict[str, Any]:
     """Fetch weather forecast data from OpenWeatherMap API"""
-    try:
-        url = f"{WEATHER_BASE_URL}/forecast?q={city}&appid={WEATHER_API_KEY}&units=metric"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Error fetching forecast for {city}: {str(e)}")
+    cache_key = city.strip().lower()
+    cached = _FORECAST_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        try:
+            response = await get_owm_client().get(
+                f"{WEATHER_BASE_URL}/forecast", params={**_COMMON_PARAMS, "q": city}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            _FORECAST_CACHE[cache_key] = data
+            return data
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=400, detail=f"Error fetching forecast for {city}: {str(e)}")
 
-def get_air_quality_data(city: str) -> Dict[str, Any]:
+    return await _single_flight("forecast", cache_key, fetch)
+
+async def get_air_quality_data(city: str, coords: Optional[tuple] = None) -> Dict[str, Any]:
     """Fetch air quality data from OpenWeatherMap API"""
-    try:
-        # First get coordinates
-        weather_data = get_weather_data(city)
-        lat = weather_data['coord']['lat']
-        lon = weather_data['coord']['lon']
-        
-        # Get air quality data
-        url = f"{WEATHER_BASE_URL}/air_pollution?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        # Return mock data if API fails
-        return {
-            "list": [{
-                "main": {"aqi": random.randint(20, 150)},
-                "components": {
-                    "co": random.uniform(200, 1000),
-                    "no": random.uniform(0, 50),
-                    "no2": random.uniform(10, 60),
-                    "o3": random.uniform(50, 120),
-                    "so2": random.uniform(5, 30),
-                    "pm2_5": random.uniform(10, 50),
-                    "pm10": random.uniform(20, 80),
-                    "nh3": random.uniform(0, 20)
-                }
-            }]
-        }
+    cache_key = city.strip().lower()
+    cached = _AIR_QUALITY_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-def get_temperature_data(city: str, days: int = 7) -> Dict[str, Any]:
-    """Extract temperature and humidity data for charting"""
+    async def fetch():
+        try:
+            # Resolve coordinates: caller-provided, then the permanent cache,
+            # then a weather lookup as a last resort
+            lat_lon = coords or _CITY_COORDS.get(cache_key)
+            if lat_lon is None:
+                weather_data = await get_weather_data(city)
+                lat_lon = (weather_data['coord']['lat'], weather_data['coord']['lon'])
+            lat, lon = lat_lon
+            
+            # Get air quality data
+            response = await get_owm_client().get(
+                f"{WEATHER_BASE_URL}/air_pollution",
+                params={"lat": lat, "lon": lon, "appid": WEATHER_API_KEY}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            _AIR_QUALITY_CACHE[cache_key] = data
+            return data
+        except httpx.HTTPError as e:
+            # Return mock data if API fails
+            return _mock_air_quality()
+
+    return await _single_flight("air_quality", cache_key, fetch)
+
+def _extract_temperature_data(forecast_data: Optional[Dict[str, Any]], city: str, days: int = 5) -> Dict[str, Any]:
+    """Shape already-fetched forecast data for the temperature chart"""
     try:
-        forecast_data = get_forecast_data(city, days)
-        
         # Extract temperature data
         dates = []
         temps = []
@@ -101,28 +207,28 @@ def get_temperature_data(city: str, days: int = 7) -> Dict[str, Any]:
         }
     except Exception as e:
         # Return mock data if API fails
-        dates = []
-        temps = []
-        humidity = []
-        
-        for i in range(7):
-            date = datetime.datetime.now() + datetime.timedelta(days=i)
-            dates.append(date.strftime('%Y-%m-%d %H:%M:%S'))
-            temps.append(round(random.uniform(15, 30), 1))
-            humidity.append(round(random.uniform(40, 80), 1))
+        now = datetime.datetime.now()
+        dates = [(now + datetime.timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S') for i in range(7)]
         
         return {
             "dates": dates,
-            "temperatures": temps,
-            "humidity": humidity,
+            "temperatures": np.round(_RNG.uniform(15, 30, 7), 1).tolist(),
+            "humidity": np.round(_RNG.uniform(40, 80, 7), 1).tolist(),
             "city": city,
             "mock": True
         }
 
-def get_air_quality_chart_data(city: str) -> Dict[str, Any]:
-    """Extract air quality data for charting"""
+async def get_temperature_data(city: str, days: int = 5) -> Dict[str, Any]:
+    """Extract temperature and humidity data for charting"""
+    try:
+        forecast_data = await get_forecast_data(city, days)
+    except Exception:
+        forecast_data = None
+    return _extract_temperature_data(forecast_data, city, days)
+
+def _extract_air_quality_chart_data(air_quality_data: Optional[Dict[str, Any]], city: str) -> Dict[str, Any]:
+    """Shape already-fetched air quality data for the pie chart"""
     try:
-        air_quality_data = get_air_quality_data(city)
         components = air_quality_data['list'][0]['components']
         
         # Prepare data for pie chart
@@ -144,7 +250,7 @@ def get_air_quality_chart_data(city: str) -> Dict[str, Any]:
     except Exception as e:
         # Return mock data if API fails
         pollutants = ['PM2.5', 'PM10', 'NO2', 'O3', 'SO2', 'CO']
-        values = [round(random.uniform(10, 50), 1) for _ in pollutants]
+        values = np.round(_RNG.uniform(10, 50, len(pollutants)), 1).tolist()
         
         return {
             "pollutants": pollutants,
@@ -153,26 +259,30 @@ def get_air_quality_chart_data(city: str) -> Dict[str, Any]:
             "mock": True
         }
 
-def get_weather_distribution_data(city: str, days: int = 30) -> Dict[str, Any]:
-    """Extract weather condition distribution data for charting"""
+async def get_air_quality_chart_data(city: str) -> Dict[str, Any]:
+    """Extract air quality data for charting"""
     try:
-        forecast_data = get_forecast_data(city, days)
-        
-        # Count weather conditions
-        weather_counts = {}
-        for item in forecast_data['list']:
-            condition = item['weather'][0]['main']
-            weather_counts[condition] = weather_counts.get(condition, 0) + 1
+        air_quality_data = await get_air_quality_data(city)
+    except Exception:
+        air_quality_data = None
+    return _extract_air_quality_chart_data(air_quality_data, city)
+
+def _extract_weather_distribution_data(forecast_data: Optional[Dict[str, Any]], city: str) -> Dict[str, Any]:
+    """Shape already-fetched forecast data into a condition distribution"""
+    try:
+        # Count weather conditions in one C-level pass, most frequent first
+        weather_counts = Counter(item['weather'][0]['main'] for item in forecast_data['list'])
+        pairs = weather_counts.most_common()
         
         return {
-            "conditions": list(weather_counts.keys()),
-            "counts": list(weather_counts.values()),
+            "conditions": [condition for condition, _ in pairs],
+            "counts": [count for _, count in pairs],
             "city": city
         }
     except Exception as e:
         # Return mock data if API fails
         conditions = ['Clear', 'Clouds', 'Rain', 'Snow', 'Thunderstorm']
-        counts = [random.randint(5, 15) for _ in conditions]
+        counts = _RNG.integers(5, 16, len(conditions)).tolist()
         
         return {
             "conditions": conditions,
@@ -181,35 +291,52 @@ def get_weather_distribution_data(city: str, days: int = 30) -> Dict[str, Any]:
             "mock": True
         }
 
-@router.get("/data", response_model=DashboardDataResponse)
+async def get_weather_distribution_data(city: str, days: int = 30) -> Dict[str, Any]:
+    """Extract weather condition distribution data for charting"""
+    try:
+        forecast_data = await get_forecast_data(city, days)
+    except Exception:
+        forecast_data = None
+    return _extract_weather_distribution_data(forecast_data, city)
+
+# response_model=None skips FastAPI's second Pydantic validation pass over the
+# (large, fully self-constructed) payload; DashboardDataResponse stays on the
+# route purely for the OpenAPI schema
+@router.get("/data", response_model=None, responses={200: {"model": DashboardDataResponse}})
 async def get_dashboard_data(
     city: str = Query(..., description="City name"),
-    days: int = Query(7, description="Number of days for forecast"),
+    days: int = Query(5, ge=1, le=5, description="Number of forecast days (OWM free tier caps at 5)"),
     data_type: str = Query("all", description="Type of data to fetch")
 ):
     """
     Get comprehensive dashboard data including weather, charts, and statistics
     """
     try:
-        # Get current weather
-        weather_data = get_weather_data(city)
+        # The three upstream fetches are independent I/O; run them
+        # concurrently so latency is max(t_i) instead of the sum
+        weather_data, air_quality_data, forecast_data = await asyncio.gather(
+            get_weather_data(city),
+            get_air_quality_data(city),
+            get_forecast_data(city, days)
+        )
+
         current_weather = {
             "city": weather_data['name'],
             "country": weather_data['sys']['country'],
-            "temperature": f"{weather_data['main']['temp']}°C",
-            "feels_like": f"{weather_data['main']['feels_like']}°C",
-            "humidity": f"{weather_data['main']['humidity']}%",
-            "pressure": f"{weather_data['main']['pressure']} hPa",
-            "wind_speed": f"{weather_data['wind']['speed']} m/s",
-            "wind_direction": f"{weather_data['wind'].get('deg', 0)}°",
-            "visibility": f"{weather_data.get('visibility', 0) / 1000:.1f} km",
-            "weather": weather_data['weather'][0]['description'].title(),
+            "temperature": weather_data['main']['temp'],
+            "feels_like": weather_data['main']['feels_like'],
+            "humidity": weather_data['main']['humidity'],
+            "pressure": weather_data['main']['pressure'],
+            "wind_speed": weather_data['wind']['speed'],
+            "wind_direction": weather_data['wind'].get('deg', 0),
+            "visibility": weather_data.get('visibility', 0) / 1000,
+            "weather": _title_case(weather_data['weather'][0]['description']),
             "weather_icon": weather_data['weather'][0]['icon'],
-            "uv_index": weather_data.get('uvi', 0)
+            "uv_index": weather_data.get('uvi', 0),
+            "units": _WEATHER_UNITS
         }
         
-        # Get air quality
-        air_quality_data = get_air_quality_data(city)
+        # Air quality
         aqi = air_quality_data['list'][0]['main']['aqi']
         components = air_quality_data['list'][0]['components']
         
@@ -227,111 +354,128 @@ async def get_dashboard_data(
             }
         }
         
-        # Get forecast
-        forecast_data = get_forecast_data(city, days)
-        forecast = []
-        for item in forecast_data['list'][:days * 8]:
-            forecast.append({
+        # Forecast - single comprehension, memoized title-casing; slice once
+        # (8 forecast entries per day)
+        forecast_items = forecast_data['list'][:days * 8]
+        forecast = [
+            {
                 "datetime": item['dt_txt'],
-                "temperature": f"{item['main']['temp']}°C",
-                "feels_like": f"{item['main']['feels_like']}°C",
-                "humidity": f"{item['main']['humidity']}%",
-                "weather": item['weather'][0]['description'].title(),
+                "temperature": item['main']['temp'],
+                "feels_like": item['main']['feels_like'],
+                "humidity": item['main']['humidity'],
+                "weather": _title_case(item['weather'][0]['description']),
                 "weather_icon": item['weather'][0]['icon'],
-                "wind_speed": f"{item['wind']['speed']} m/s",
-                "pressure": f"{item['main']['pressure']} hPa"
-            })
+                "wind_speed": item['wind']['speed'],
+                "pressure": item['main']['pressure']
+            }
+            for item in forecast_items
+        ]
         
         # Get chart data
         chart_data = {}
         if data_type in ["all", "charts"]:
+            # Reuse the data fetched above instead of re-hitting the API
             chart_data = {
-                "temperature": get_temperature_data(city, days),
-                "air_quality": get_air_quality_chart_data(city),
-                "weather_distribution": get_weather_distribution_data(city, days)
+                "temperature": _extract_temperature_data(forecast_data, city, days),
+                "air_quality": _extract_air_quality_chart_data(air_quality_data, city),
+                "weather_distribution": _extract_weather_distribution_data(forecast_data, city)
             }
         
         # Calculate summary statistics
         summary_stats = {
-            "avg_temperature": f"{weather_data['main']['temp']}°C",
-            "humidity": f"{weather_data['main']['humidity']}%",
+            "avg_temperature": weather_data['main']['temp'],
+            "humidity": weather_data['main']['humidity'],
             "air_quality": get_aqi_category(aqi),
-            "wind_speed": f"{weather_data['wind']['speed']} m/s",
-            "pressure": f"{weather_data['main']['pressure']} hPa",
-            "visibility": f"{weather_data.get('visibility', 0) / 1000:.1f} km"
+            "wind_speed": weather_data['wind']['speed'],
+            "pressure": weather_data['main']['pressure'],
+            "visibility": weather_data.get('visibility', 0) / 1000
         }
         
-        return DashboardDataResponse(
-            city=city,
-            current_weather=current_weather,
-            summary_stats=summary_stats,
-            chart_data=chart_data,
-            air_quality=air_quality,
-            forecast=forecast
-        )
+        return ORJSONResponse({
+            "city": city,
+            "current_weather": current_weather,
+            "summary_stats": summary_stats,
+            "chart_data": chart_data,
+            "air_quality": air_quality,
+            "forecast": forecast
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating dashboard data: {str(e)}")
 
+# AQI thresholds with parallel category/impact tables; bisect replaces the
+# if/elif ladders run on every dashboard response
+_AQI_THRESHOLDS = (50, 100, 150, 200, 300)
+_AQI_CATEGORIES = (
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous"
+)
+_AQI_HEALTH_IMPACTS = (
+    "Air quality is satisfactory, and air pollution poses little or no risk.",
+    "Air quality is acceptable. However, there may be a risk for some people, particularly those who are unusually sensitive to air pollution.",
+    "Members of sensitive groups may experience health effects. The general public is less likely to be affected.",
+    "Some members of the general public may experience health effects; members of sensitive groups may experience more serious health effects.",
+    "Health alert: The risk of health effects is increased for everyone.",
+    "Health warning of emergency conditions: everyone is more likely to be affected."
+)
+
 def get_aqi_category(aqi: int) -> str:
     """Convert AQI number to category"""
-    if aqi <= 50:
-        return "Good"
-    elif aqi <= 100:
-        return "Moderate"
-    elif aqi <= 150:
-        return "Unhealthy for Sensitive Groups"
-    elif aqi <= 200:
-        return "Unhealthy"
-    elif aqi <= 300:
-        return "Very Unhealthy"
-    else:
-        return "Hazardous"
+    return _AQI_CATEGORIES[bisect.bisect_left(_AQI_THRESHOLDS, aqi)]
 
 def get_aqi_health_impact(aqi: int) -> str:
     """Get health impact description based on AQI"""
-    if aqi <= 50:
-        return "Air quality is satisfactory, and air pollution poses little or no risk."
-    elif aqi <= 100:
-        return "Air quality is acceptable. However, there may be a risk for some people, particularly those who are unusually sensitive to air pollution."
-    elif aqi <= 150:
-        return "Members of sensitive groups may experience health effects. The general public is less likely to be affected."
-    elif aqi <= 200:
-        return "Some members of the general public may experience health effects; members of sensitive groups may experience more serious health effects."
-    elif aqi <= 300:
-        return "Health alert: The risk of health effects is increased for everyone."
-    else:
-        return "Health warning of emergency conditions: everyone is more likely to be affected."
+    return _AQI_HEALTH_IMPACTS[bisect.bisect_left(_AQI_THRESHOLDS, aqi)]
+
+# Default popular cities returned when no query is provided (also reused by
+# routes/weather.py so the list exists in one place)
+DEFAULT_CITIES = [
+    {"name": "London", "country": "GB", "state": "England", "lat": 51.5074, "lon": -0.1278},
+    {"name": "New York", "country": "US", "state": "NY", "lat": 40.7128, "lon": -74.0060},
+    {"name": "Tokyo", "country": "JP", "state": "Tokyo", "lat": 35.6762, "lon": 139.6503},
+    {"name": "Paris", "country": "FR", "state": "Île-de-France", "lat": 48.8566, "lon": 2.3522},
+    {"name": "Sydney", "country": "AU", "state": "NSW", "lat": -33.8688, "lon": 151.2093},
+    {"name": "Mumbai", "country": "IN", "state": "Maharashtra", "lat": 19.0760, "lon": 72.8777},
+    {"name": "São Paulo", "country": "BR", "state": "São Paulo", "lat": -23.5505, "lon": -46.6333},
+    {"name": "Cairo", "country": "EG", "state": "Cairo", "lat": 30.0444, "lon": 31.2357},
+    {"name": "Berlin", "country": "DE", "state": "Berlin", "lat": 52.5200, "lon": 13.4050},
+    {"name": "Beijing", "country": "CN", "state": "Beijing", "lat": 39.9042, "lon": 116.4074},
+    {"name": "Lagos", "country": "NG", "state": "Lagos", "lat": 6.5244, "lon": 3.3792},
+    {"name": "Bangkok", "country": "TH", "state": "Bangkok", "lat": 13.7563, "lon": 100.5018}
+]
+
+# The empty-query case dominates homepage autocomplete traffic, so the default
+# list is serialized once per limit at import time and returned as-is
+_DEFAULT_CITIES_JSON = {
+    k: orjson.dumps({"cities": DEFAULT_CITIES[:k]}) for k in range(1, len(DEFAULT_CITIES) + 1)
+}
 
 @router.get("/cities/search")
 async def search_cities(query: str = Query("", description="Search query"), limit: int = Query(10, description="Maximum number of results")):
     """
     Search for cities with autocomplete functionality
     """
-    # Default popular cities when no query is provided
-    default_cities = [
-        {"name": "London", "country": "GB", "state": "England", "lat": 51.5074, "lon": -0.1278},
-        {"name": "New York", "country": "US", "state": "NY", "lat": 40.7128, "lon": -74.0060},
-        {"name": "Tokyo", "country": "JP", "state": "Tokyo", "lat": 35.6762, "lon": 139.6503},
-        {"name": "Paris", "country": "FR", "state": "Île-de-France", "lat": 48.8566, "lon": 2.3522},
-        {"name": "Sydney", "country": "AU", "state": "NSW", "lat": -33.8688, "lon": 151.2093},
-        {"name": "Mumbai", "country": "IN", "state": "Maharashtra", "lat": 19.0760, "lon": 72.8777},
-        {"name": "São Paulo", "country": "BR", "state": "São Paulo", "lat": -23.5505, "lon": -46.6333},
-        {"name": "Cairo", "country": "EG", "state": "Cairo", "lat": 30.0444, "lon": 31.2357},
-        {"name": "Berlin", "country": "DE", "state": "Berlin", "lat": 52.5200, "lon": 13.4050},
-        {"name": "Beijing", "country": "CN", "state": "Beijing", "lat": 39.9042, "lon": 116.4074}
-    ]
-    
-    # If no query provided, return default cities
+    # If no query provided, return the pre-serialized default cities
     if not query or query.strip() == "":
-        return {"cities": default_cities[:limit]}
+        return Response(_DEFAULT_CITIES_JSON[min(max(limit, 1), len(DEFAULT_CITIES))], media_type="application/json")
     
+    cache_key = (query.strip().lower(), limit)
+    cached = _CITY_SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # Use OpenWeatherMap's geocoding API for real city search
-        url = f"http://api.openweathermap.org/geo/1.0/direct?q={query}&limit={limit}&appid={WEATHER_API_KEY}"
-        response = requests.get(url)
+        response = await get_owm_client().get(
+            "http://api.openweathermap.org/geo/1.0/direct",
+            params={"q": query, "limit": limit, "appid": WEATHER_API_KEY}
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         cities = []
         for city in data:
@@ -346,39 +490,62 @@ async def search_cities(query: str = Query("", description="Search query"), limi
         # If no results from API, fall back to filtering default cities
         if not cities:
             filtered_cities = [
-                city for city in default_cities 
+                city for city in DEFAULT_CITIES 
                 if query.lower() in city["name"].lower()
             ][:limit]
-            return {"cities": filtered_cities}
+            result = {"cities": filtered_cities}
+            _CITY_SEARCH_CACHE[cache_key] = result
+            return result
         
-        return {"cities": cities}
+        result = {"cities": cities}
+        _CITY_SEARCH_CACHE[cache_key] = result
+        return result
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         # Fallback to sample cities if API fails
         filtered_cities = [
-            city for city in default_cities 
+            city for city in DEFAULT_CITIES 
             if query.lower() in city["name"].lower()
         ][:limit]
         
         return {"cities": filtered_cities}
 
+# Serialized chart payloads keyed by (chart_type, city, days); warm hits are
+# served as the cached bytes with no dict rebuild or re-encode. Short TTL so
+# entries never outlive the air-quality cache they may be derived from.
+_CHART_JSON_CACHE = TTLCache(maxsize=1024, ttl=60)
+
 @router.get("/chart-data/{chart_type}")
 async def get_chart_data(
     chart_type: str,
     city: str = Query(..., description="City name"),
-    days: int = Query(7, description="Number of days")
+    days: int = Query(5, ge=1, le=5, description="Number of forecast days (OWM free tier caps at 5)")
 ):
     """
     Get specific chart data (raw data for frontend charting)
     """
+    cache_key = (chart_type, city.strip().lower(), days)
+    cached = _CHART_JSON_CACHE.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+
     try:
         if chart_type == "temperature":
-            return get_temperature_data(city, days)
+            data = await get_temperature_data(city, days)
         elif chart_type == "air_quality":
-            return get_air_quality_chart_data(city)
+            data = await get_air_quality_chart_data(city)
         elif chart_type == "weather_distribution":
-            return get_weather_distribution_data(city, days)
+            data = await get_weather_distribution_data(city, days)
         else:
             raise HTTPException(status_code=400, detail=f"Unknown chart type: {chart_type}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting chart data: {str(e)}")
+
+    body = orjson.dumps(data)
+    # Mock fallbacks are not cached so real data replaces them immediately
+    # once the upstream API recovers
+    if not data.get("mock"):
+        _CHART_JSON_CACHE[cache_key] = body
+    return Response(body, media_type="application/json")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import requests
-import os
+import httpx
+import numpy as np
+import orjson
 from typing import Optional, Dict, Any
-from dotenv import load_dotenv
-load_dotenv()
+from functools import lru_cache
+from http_client import get_owm_client
+from config import WEATHER_API_KEY
+from routes.dashboard import DEFAULT_CITIES
 
 router = APIRouter()
 
@@ -32,10 +35,21 @@ class ClimateDataResponse(BaseModel):
     precipitation_trend: list[float]
     air_quality_trend: list[float]
 
-# OpenWeatherMap API configuration
-WEATHER_API_KEY =os.getenv("api_key")
+# OpenWeatherMap API configuration (key comes from config.py)
 WEATHER_BASE_URL = "http://api.openweathermap.org/data/2.5"
 
+# Query params shared by every data/2.5 call; httpx handles URL escaping, so
+# city names with spaces or accents ("São Paulo") are encoded correctly
+_COMMON_PARAMS = {"appid": WEATHER_API_KEY, "units": "metric"}
+
+# Shared generator for sample/mock data
+_RNG = np.random.default_rng()
+
+@lru_cache(maxsize=64)
+def _title_case(description: str) -> str:
+    """Memoized str.title(); OWM only emits a few dozen condition strings"""
+    return description.title()
+
 @router.get("/current/{city}", response_model=WeatherResponse)
 async def get_current_weather(city: str, country_code: Optional[str] = None):
     """
@@ -55,17 +69,17 @@ async def get_current_weather(city: str, country_code: Optional[str] = None):
         else:
             location = city
             
-        url = f"{WEATHER_BASE_URL}/weather?q={location}&appid={WEATHER_API_KEY}&units=metric"
-        
-        response = requests.get(url)
+        response = await get_owm_client().get(
+            f"{WEATHER_BASE_URL}/weather", params={**_COMMON_PARAMS, "q": location}
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Extract weather information
         weather_info = WeatherResponse(
             city=data['name'],
             country=data['sys']['country'],
-            weather=data['weather'][0]['description'].title(),
+            weather=_title_case(data['weather'][0]['description']),
             temperature=f"{data['main']['temp']}°C",
             humidity=f"{data['main']['humidity']}%",
             wind_speed=f"{data['wind']['speed']} m/s",
@@ -79,34 +93,36 @@ async def get_current_weather(city: str, country_code: Optional[str] = None):
         
         return weather_info
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=400, detail=f"Error fetching weather for {city}: {str(e)}")
     except KeyError as e:
         raise HTTPException(status_code=500, detail=f"Error parsing weather data: {str(e)}")
 
 @router.get("/forecast/{city}")
-async def get_weather_forecast(city: str, days: int = 5):
+async def get_weather_forecast(city: str, days: int = Query(5, ge=1, le=5)):
     """
     Get weather forecast for a specific city
     """
     try:
         city = city.strip().strip('"').strip("'")
-        url = f"{WEATHER_BASE_URL}/forecast?q={city}&appid={WEATHER_API_KEY}&units=metric"
-        
-        response = requests.get(url)
+        response = await get_owm_client().get(
+            f"{WEATHER_BASE_URL}/forecast", params={**_COMMON_PARAMS, "q": city}
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Process forecast data
-        forecast = []
-        for item in data['list'][:days * 8]:  # 8 forecasts per day (3-hour intervals)
-            forecast.append({
+        # Process forecast data in a single comprehension (8 forecasts per
+        # day at 3-hour intervals)
+        forecast = [
+            {
                 "datetime": item['dt_txt'],
                 "temperature": f"{item['main']['temp']}°C",
-                "weather": item['weather'][0]['description'].title(),
+                "weather": _title_case(item['weather'][0]['description']),
                 "humidity": f"{item['main']['humidity']}%",
                 "wind_speed": f"{item['wind']['speed']} m/s"
-            })
+            }
+            for item in data['list'][:days * 8]
+        ]
         
         return {
             "city": data['city']['name'],
@@ -114,7 +130,7 @@ async def get_weather_forecast(city: str, days: int = 5):
             "forecast": forecast
         }
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=400, detail=f"Error fetching forecast for {city}: {str(e)}")
     except KeyError as e:
         raise HTTPException(status_code=500, detail=f"Error parsing forecast data: {str(e)}")
@@ -128,20 +144,18 @@ async def get_climate_data(city: str):
     try:
         # For demo purposes, we'll generate sample climate trend data
         # In a real application, you'd fetch this from a climate data service
-        
-        import random
-        import datetime
-        
-        # Generate sample trend data (last 30 days)
+
+        # Generate sample trend data (last 30 days) in four vectorized draws
+        # instead of 120 Python-level RNG calls
         base_temp = 20.0  # Base temperature
         base_humidity = 60.0  # Base humidity
         base_precipitation = 2.0  # Base precipitation
         base_air_quality = 50.0  # Base air quality index
-        
-        temperature_trend = [base_temp + random.uniform(-5, 5) for _ in range(30)]
-        humidity_trend = [base_humidity + random.uniform(-10, 10) for _ in range(30)]
-        precipitation_trend = [max(0, base_precipitation + random.uniform(-1, 3)) for _ in range(30)]
-        air_quality_trend = [max(0, base_air_quality + random.uniform(-20, 20)) for _ in range(30)]
+
+        temperature_trend = (base_temp + _RNG.uniform(-5, 5, 30)).tolist()
+        humidity_trend = (base_humidity + _RNG.uniform(-10, 10, 30)).tolist()
+        precipitation_trend = np.maximum(0, base_precipitation + _RNG.uniform(-1, 3, 30)).tolist()
+        air_quality_trend = np.maximum(0, base_air_quality + _RNG.uniform(-20, 20, 30)).tolist()
         
         return ClimateDataResponse(
             city=city,
@@ -163,9 +177,7 @@ async def get_air_quality(city: str):
         # This would typically use an air quality API like OpenWeatherMap's air pollution API
         # For demo purposes, we'll return sample data
         
-        import random
-        
-        aqi = random.randint(20, 150)
+        aqi = int(_RNG.integers(20, 151))
         
         # Determine air quality category
         if aqi <= 50:
@@ -186,12 +198,10 @@ async def get_air_quality(city: str):
             "aqi": aqi,
             "category": category,
             "health_impact": health_impact,
-            "pollutants": {
-                "pm2_5": round(random.uniform(10, 50), 1),
-                "pm10": round(random.uniform(20, 80), 1),
-                "o3": round(random.uniform(50, 120), 1),
-                "no2": round(random.uniform(20, 60), 1)
-            }
+            "pollutants": dict(zip(
+                ("pm2_5", "pm10", "o3", "no2"),
+                np.round(_RNG.uniform((10, 20, 50, 20), (50, 80, 120, 60)), 1).tolist()
+            ))
         }
         
     except Exception as e:
@@ -202,23 +212,9 @@ async def search_cities(query: str, limit: int = 10):
     """
     Search for cities by name
     """
-    # Sample cities for demo - in production, you'd use a geocoding API
-    sample_cities = [
-        {"name": "London", "country": "GB", "state": "England"},
-        {"name": "New York", "country": "US", "state": "NY"},
-        {"name": "Tokyo", "country": "JP", "state": "Tokyo"},
-        {"name": "Paris", "country": "FR", "state": "Île-de-France"},
-        {"name": "Sydney", "country": "AU", "state": "NSW"},
-        {"name": "Mumbai", "country": "IN", "state": "Maharashtra"},
-        {"name": "São Paulo", "country": "BR", "state": "São Paulo"},
-        {"name": "Cairo", "country": "EG", "state": "Cairo"},
-        {"name": "Lagos", "country": "NG", "state": "Lagos"},
-        {"name": "Bangkok", "country": "TH", "state": "Bangkok"}
-    ]
-    
-    # Filter cities based on query
+    # Filter the shared sample list - in production, you'd use a geocoding API
     filtered_cities = [
-        city for city in sample_cities 
+        city for city in DEFAULT_CITIES 
         if query.lower() in city["name"].lower()
     ][:limit]
     
@@ -1,266 +1,270 @@
-import plotly.graph_objects as go
-import plotly.express as px
+import orjson
 import pandas as pd
 import numpy as np
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
+
+# Charts are built as plain dicts in the Plotly.js figure schema instead of
+# go.Figure/go.Bar objects: graph_objects runs every attribute through its
+# validator hierarchy only for to_dict() to flatten the result right back,
+# and the frontend only ever sees the dict. The figure and "layout" keys
+# share one layout dict, so it is serialized once.
+#
+# Each public function converts its inputs to hashable tuples and delegates
+# to an lru_cache'd builder, so a repeated request for the same city/data
+# skips the build entirely. The cached dicts are shared - callers must treat
+# the returned figure as read-only.
+
+# Bin edges and palettes for vectorized color mapping. searchsorted with
+# side='right' reproduces the old per-element if/elif ladders exactly
+# (index = number of edges <= value) in a single C-level pass.
+_TEMP_EDGES = np.array([0.0, 10.0, 20.0, 30.0])
+_WIND_EDGES = np.array([2.0, 5.0, 10.0])
+_WIND_PALETTE = np.array(['#90EE90', '#FFEAA7', '#FFB347', '#FF6B6B'])
+
+# The temperature charts ship small integer bin indices plus this fixed
+# colorscale instead of one hex string per bar - same rendered colors,
+# roughly 8x less color data on the wire for long series
+_TEMP_COLORSCALE = [[0, '#0000FF'], [0.25, '#87CEEB'], [0.5, '#4ECDC4'], [0.75, '#FFB347'], [1, '#FF6B6B']]
+
+# Constant labels and palettes hoisted to module scope (immutable tuples) so
+# each call stops re-allocating identical lists
+_COMPONENT_KEYS = ('pm2_5', 'pm10', 'no2', 'o3', 'so2', 'co')
+_COMPONENT_LABELS = ('PM2.5', 'PM10', 'NO2', 'O3', 'SO2', 'CO')
+_AQ_COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD')
+# ndarray rather than tuple: slicing an ndarray is a view, so trimming the
+# palette to the number of conditions allocates nothing until .tolist()
+_WEATHER_COLORS = np.array(['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#FFB6C1', '#98FB98'])
+
+# itemgetter pulls both fields per row in one C call; zip(*...) then splits
+# the rows into the column tuples the cached builders key on
+_HOURLY_FIELDS = itemgetter('datetime', 'temperature')
+_WIND_FIELDS = itemgetter('datetime', 'wind_speed')
+
+# Optional numba JIT for the bin-index kernels: the explicit loop compiles to
+# an unrolled machine-code switch. The explicit signature forces compilation
+# at import instead of on the first request, and cache=True persists the
+# compiled code to disk so later process starts skip LLVM entirely. fastmath
+# only reassociates the comparisons, which cannot change their results.
+# Plain searchsorted stays as the fallback - semantics are identical
+# (index = number of edges <= value).
+try:
+    from numba import njit
+
+    @njit('uint8[:](float64[:], float64[:])', cache=True, boundscheck=False, fastmath=True)
+    def _bin_kernel(values, edges):
+        out = np.empty(values.size, np.uint8)
+        for i in range(values.size):
+            v = values[i]
+            idx = 0
+            for e in edges:
+                if v >= e:
+                    idx += 1
+            out[i] = idx
+        return out
+
+    def _bin_right(values, edges):
+        """Bin values against ascending edges (strict-less-than ladders)"""
+        return _bin_kernel(np.asarray(values, dtype=np.float64), edges)
+except ImportError:
+    def _bin_right(values, edges):
+        """Bin values against ascending edges (strict-less-than ladders)"""
+        return np.searchsorted(edges, values, side='right')
+
+# Shared layout skeleton for the bar charts: one small helper fills in the
+# per-chart title and axis labels instead of each builder re-constructing the
+# same nested layout dict from scratch
+_TITLE_BASE = {'x': 0.5, 'xanchor': 'center', 'font': {'size': 16}}
+
+def _bar_layout(title: str, x_title: str, y_title: str, tickangle: int = 45) -> Dict[str, Any]:
+    xaxis = {"title": {"text": x_title}}
+    if tickangle is not None:
+        xaxis["tickangle"] = tickangle
+    return {
+        "title": {**_TITLE_BASE, "text": title},
+        "xaxis": xaxis,
+        "yaxis": {"title": {"text": y_title}},
+        "template": 'plotly_white',
+        "height": 400
+    }
+
+def chart_to_json(chart: Dict[str, Any]) -> bytes:
+    """Serialize a chart dict straight to JSON bytes.
+
+    OPT_SERIALIZE_NUMPY lets orjson encode any ndarray values (bin counts,
+    formatted label arrays) natively, so builders do not have to round-trip
+    through .tolist() before the wire.
+    """
+    return orjson.dumps(chart, option=orjson.OPT_SERIALIZE_NUMPY)
+
+@lru_cache(maxsize=128)
+def _temperature_bar_chart(temperature_data: tuple, dates: tuple, city: str) -> Dict[str, Any]:
+    trace = {
+        "type": "bar",
+        "x": dates,
+        "y": temperature_data,
+        # Color gradient based on temperature values (cold blue -> hot red)
+        "marker": {
+            "color": _bin_right(temperature_data, _TEMP_EDGES),
+            "colorscale": _TEMP_COLORSCALE,
+            "cmin": 0,
+            "cmax": 4
+        },
+        "text": np.char.mod('%.1f°C', np.asarray(temperature_data)).tolist(),
+        "textposition": "auto",
+        "hovertemplate": '<b>%{x}</b><br>Temperature: %{y:.1f}°C<extra></extra>'
+    }
+
+    layout = _bar_layout(f'Daily Temperature Trends - {city}', 'Date', 'Temperature (°C)')
+
+    return {
+        "chart_type": "temperature_bar",
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
+    }
 
 def create_temperature_bar_chart(temperature_data: List[float], dates: List[str], city: str) -> Dict[str, Any]:
     """
     Create a bar chart for temperature trends
     """
-    fig = go.Figure()
-    
-    # Create color gradient based on temperature values
-    colors = []
-    for temp in temperature_data:
-        if temp < 0:
-            colors.append('#0000FF')  # Blue for very cold
-        elif temp < 10:
-            colors.append('#87CEEB')  # Light blue for cold
-        elif temp < 20:
-            colors.append('#4ECDC4')  # Teal for cool
-        elif temp < 30:
-            colors.append('#FFB347')  # Orange for warm
-        else:
-            colors.append('#FF6B6B')  # Red for hot
-    
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=temperature_data,
-        marker_color=colors,
-        text=[f'{temp:.1f}°C' for temp in temperature_data],
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>Temperature: %{y:.1f}°C<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title={
-            'text': f'Daily Temperature Trends - {city}',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16}
-        },
-        xaxis_title='Date',
-        yaxis_title='Temperature (°C)',
-        template='plotly_white',
-        height=400,
-        xaxis=dict(tickangle=45)
-    )
-    
+    return _temperature_bar_chart(tuple(temperature_data), tuple(dates), city)
+
+@lru_cache(maxsize=128)
+def _air_quality_bar_chart(row_items: tuple, city: str) -> Dict[str, Any]:
+    # Extract components in one pass; missing keys default to 0
+    row = dict(row_items)
+    values = [row.get(component, 0) for component in _COMPONENT_KEYS]
+    values[5] /= 1000  # Convert CO from μg/m³ to mg/m³
+
+    trace = {
+        "type": "bar",
+        "x": _COMPONENT_LABELS,
+        "y": values,
+        "marker": {"color": _AQ_COLORS},
+        "text": np.char.mod('%.2f', np.asarray(values)).tolist(),
+        "textposition": "auto",
+        "hovertemplate": '<b>%{x}</b><br>Value: %{y:.2f}<extra></extra>'
+    }
+
+    layout = _bar_layout(f'Air Quality Components - {city}', 'Air Quality Component', 'Concentration', tickangle=None)
+
     return {
-        "chart_type": "temperature_bar",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "chart_type": "air_quality_bar",
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
 def create_air_quality_bar_chart(air_quality_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
     """
     Create a bar chart for air quality components
     """
-    # Extract components data
-    components = ['PM2.5', 'PM10', 'NO2', 'O3', 'SO2', 'CO']
-    values = []
-    
-    for component in ['pm2_5', 'pm10', 'no2', 'o3', 'so2', 'co']:
-        if air_quality_data and component in air_quality_data[0]:
-            val = air_quality_data[0][component]
-            if component == 'co':
-                val = val / 1000  # Convert CO from μg/m³ to mg/m³
-            values.append(val)
-        else:
-            values.append(0)
-    
-    # Define colors for each component
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=components,
-        y=values,
-        marker_color=colors,
-        text=[f'{val:.2f}' for val in values],
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>Value: %{y:.2f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title={
-            'text': f'Air Quality Components - {city}',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16}
-        },
-        xaxis_title='Air Quality Component',
-        yaxis_title='Concentration',
-        template='plotly_white',
-        height=400
-    )
-    
+    row_items = tuple(sorted(air_quality_data[0].items())) if air_quality_data else ()
+    return _air_quality_bar_chart(row_items, city)
+
+@lru_cache(maxsize=128)
+def _weather_conditions_bar_chart(observed: tuple, city: str) -> Dict[str, Any]:
+    # Count weather conditions; most_common() already sorts by frequency and
+    # zip(*...) splits the pairs into both columns in a single pass
+    pairs = Counter(observed).most_common()
+    conditions, counts = map(list, zip(*pairs)) if pairs else ([], [])
+
+    trace = {
+        "type": "bar",
+        "x": conditions,
+        "y": counts,
+        "marker": {"color": _WEATHER_COLORS[:len(conditions)].tolist()},
+        "text": counts,
+        "textposition": "auto",
+        "hovertemplate": '<b>%{x}</b><br>Frequency: %{y}<extra></extra>'
+    }
+
+    layout = _bar_layout(f'Weather Conditions Frequency - {city}', 'Weather Condition', 'Frequency')
+
     return {
-        "chart_type": "air_quality_bar",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "chart_type": "weather_conditions_bar",
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
 def create_weather_conditions_bar_chart(weather_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
     """
     Create a bar chart for weather conditions frequency
     """
-    # Count weather conditions
-    weather_counts = {}
-    for item in weather_data:
-        condition = item.get('weather', 'Unknown')
-        weather_counts[condition] = weather_counts.get(condition, 0) + 1
-    
-    # Sort by frequency
-    sorted_conditions = sorted(weather_counts.items(), key=lambda x: x[1], reverse=True)
-    conditions = [item[0] for item in sorted_conditions]
-    counts = [item[1] for item in sorted_conditions]
-    
-    # Define colors
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#FFB6C1', '#98FB98']
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=conditions,
-        y=counts,
-        marker_color=colors[:len(conditions)],
-        text=counts,
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>Frequency: %{y}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title={
-            'text': f'Weather Conditions Frequency - {city}',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16}
+    observed = tuple(item.get('weather', 'Unknown') for item in weather_data)
+    return _weather_conditions_bar_chart(observed, city)
+
+@lru_cache(maxsize=128)
+def _hourly_temperature_bar_chart(datetimes: tuple, temperatures: tuple, city: str) -> Dict[str, Any]:
+    # Parse every datetime in one vectorized pass (cache=True dedups repeated
+    # strings) instead of a strptime call per row
+    dts = pd.to_datetime(list(datetimes), format='%Y-%m-%d %H:%M:%S', cache=True)
+    hours = dts.strftime('%H:%M').tolist()
+
+    trace = {
+        "type": "bar",
+        "x": hours,
+        "y": temperatures,
+        # Color gradient based on temperature (cold blue -> hot red)
+        "marker": {
+            "color": _bin_right(temperatures, _TEMP_EDGES),
+            "colorscale": _TEMP_COLORSCALE,
+            "cmin": 0,
+            "cmax": 4
         },
-        xaxis_title='Weather Condition',
-        yaxis_title='Frequency',
-        template='plotly_white',
-        height=400,
-        xaxis=dict(tickangle=45)
-    )
-    
+        "text": np.char.mod('%.1f°C', np.asarray(temperatures)).tolist(),
+        "textposition": "auto",
+        "hovertemplate": '<b>%{x}</b><br>Temperature: %{y:.1f}°C<extra></extra>'
+    }
+
+    layout = _bar_layout(f'Hourly Temperature Variations - {city}', 'Time', 'Temperature (°C)')
+
     return {
-        "chart_type": "weather_conditions_bar",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "chart_type": "hourly_temperature_bar",
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
 def create_hourly_temperature_bar_chart(hourly_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
     """
     Create a bar chart for hourly temperature variations
     """
-    hours = []
-    temperatures = []
-    
-    for item in hourly_data:
-        # Extract hour from datetime
-        dt = datetime.strptime(item['datetime'], '%Y-%m-%d %H:%M:%S')
-        hours.append(dt.strftime('%H:%M'))
-        temperatures.append(item['temperature'])
-    
-    # Create color gradient based on temperature
-    colors = []
-    for temp in temperatures:
-        if temp < 0:
-            colors.append('#0000FF')
-        elif temp < 10:
-            colors.append('#87CEEB')
-        elif temp < 20:
-            colors.append('#4ECDC4')
-        elif temp < 30:
-            colors.append('#FFB347')
-        else:
-            colors.append('#FF6B6B')
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=hours,
-        y=temperatures,
-        marker_color=colors,
-        text=[f'{temp:.1f}°C' for temp in temperatures],
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>Temperature: %{y:.1f}°C<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title={
-            'text': f'Hourly Temperature Variations - {city}',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16}
-        },
-        xaxis_title='Time',
-        yaxis_title='Temperature (°C)',
-        template='plotly_white',
-        height=400,
-        xaxis=dict(tickangle=45)
-    )
-    
+    if hourly_data:
+        datetimes, temperatures = zip(*map(_HOURLY_FIELDS, hourly_data))
+    else:
+        datetimes = temperatures = ()
+    return _hourly_temperature_bar_chart(datetimes, temperatures, city)
+
+@lru_cache(maxsize=128)
+def _wind_speed_bar_chart(dates: tuple, wind_speeds: tuple, city: str) -> Dict[str, Any]:
+    # Color gradient based on wind speed (calm green -> strong red)
+    colors = _WIND_PALETTE[_bin_right(wind_speeds, _WIND_EDGES)].tolist()
+
+    trace = {
+        "type": "bar",
+        "x": dates,
+        "y": wind_speeds,
+        "marker": {"color": colors},
+        "text": np.char.mod('%.1f m/s', np.asarray(wind_speeds)).tolist(),
+        "textposition": "auto",
+        "hovertemplate": '<b>%{x}</b><br>Wind Speed: %{y:.1f} m/s<extra></extra>'
+    }
+
+    layout = _bar_layout(f'Wind Speed Variations - {city}', 'Date', 'Wind Speed (m/s)')
+
     return {
-        "chart_type": "hourly_temperature_bar",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "chart_type": "wind_speed_bar",
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
 def create_wind_speed_bar_chart(wind_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
     """
     Create a bar chart for wind speed variations
     """
-    dates = []
-    wind_speeds = []
-    
-    for item in wind_data:
-        dates.append(item['datetime'])
-        wind_speeds.append(item['wind_speed'])
-    
-    # Create color gradient based on wind speed
-    colors = []
-    for speed in wind_speeds:
-        if speed < 2:
-            colors.append('#90EE90')  # Light green for calm
-        elif speed < 5:
-            colors.append('#FFEAA7')  # Yellow for light breeze
-        elif speed < 10:
-            colors.append('#FFB347')  # Orange for moderate breeze
-        else:
-            colors.append('#FF6B6B')  # Red for strong wind
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=wind_speeds,
-        marker_color=colors,
-        text=[f'{speed:.1f} m/s' for speed in wind_speeds],
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>Wind Speed: %{y:.1f} m/s<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title={
-            'text': f'Wind Speed Variations - {city}',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16}
-        },
-        xaxis_title='Date',
-        yaxis_title='Wind Speed (m/s)',
-        template='plotly_white',
-        height=400,
-        xaxis=dict(tickangle=45)
-    )
-    
-    return {
-        "chart_type": "wind_speed_bar",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
-    }
+    if wind_data:
+        dates, wind_speeds = zip(*map(_WIND_FIELDS, wind_data))
+    else:
+        dates = wind_speeds = ()
+    return _wind_speed_bar_chart(dates, wind_speeds, city)
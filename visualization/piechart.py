@@ -1,186 +1,204 @@
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import numpy as np
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, Any, List
+from visualization.barchart import _bin_right, _COMPONENT_KEYS
 
-def create_air_quality_pie_chart(components: Dict[str, float], city: str) -> Dict[str, Any]:
-    """
-    Create a pie chart for air quality components
-    """
-    # Normalize component names and values
-    pollutants = ['PM2.5', 'PM10', 'NO2', 'O3', 'SO2', 'CO']
-    values = [
-        components.get('pm2_5', 0),
-        components.get('pm10', 0),
-        components.get('no2', 0),
-        components.get('o3', 0),
-        components.get('so2', 0),
-        components.get('co', 0) / 1000  # Convert CO from μg/m³ to mg/m³
-    ]
-    
-    # Define colors for each pollutant
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=pollutants,
-        values=values,
-        hole=0.3,
-        marker_colors=colors,
-        textinfo='label+percent',
-        textfont_size=12,
-        hovertemplate='<b>%{label}</b><br>Value: %{value:.2f}<br>Percentage: %{percent}<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title={
+# Charts are built as plain dicts in the Plotly.js figure schema instead of
+# go.Figure/go.Pie objects; see barchart.py for the rationale. The figure and
+# "layout" keys share one layout dict, so it is serialized once.
+#
+# As in barchart.py, each public function converts its inputs to hashable
+# tuples and delegates to an lru_cache'd builder; the cached dicts are shared
+# and must be treated as read-only by callers.
+
+# Constant labels and palettes hoisted to module scope (immutable tuples) so
+# each call stops re-allocating identical lists
+_POLLUTANT_LABELS = ('PM2.5', 'PM10', 'NO2', 'O3', 'SO2', 'CO')
+_AQ_COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD')
+# ndarray so the per-call palette trim below is a view, not a copy
+_WEATHER_COLORS = np.array(['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#FFB6C1', '#98FB98'])
+_TEMP_RANGES = ('Cold (<10°C)', 'Cool (10-20°C)', 'Warm (20-30°C)', 'Hot (>30°C)')
+_TEMP_RANGE_COLORS = ('#87CEEB', '#4ECDC4', '#FFB347', '#FF6B6B')
+_HUMIDITY_RANGES = ('Low (<40%)', 'Moderate (40-60%)', 'High (60-80%)', 'Very High (>80%)')
+_HUMIDITY_RANGE_COLORS = ('#E6E6FA', '#B0E0E6', '#87CEEB', '#4682B4')
+
+# Histogram bin edges for the temperature/humidity distribution pies
+_TEMP_HIST_EDGES = np.array([10.0, 20.0, 30.0])
+_HUMIDITY_HIST_EDGES = np.array([40.0, 60.0, 80.0])
+
+# Side legend shared by the single-pie charts
+_PIE_LEGEND = {
+    "orientation": "v",
+    "yanchor": "middle",
+    "y": 0.5,
+    "xanchor": "left",
+    "x": 1.02
+}
+
+@lru_cache(maxsize=128)
+def _air_quality_pie_chart(component_items: tuple, city: str) -> Dict[str, Any]:
+    # Normalize component names and values in one pass
+    components = dict(component_items)
+    values = [components.get(key, 0) for key in _COMPONENT_KEYS]
+    values[-1] /= 1000  # Convert CO from μg/m³ to mg/m³
+
+    trace = {
+        "type": "pie",
+        "labels": _POLLUTANT_LABELS,
+        "values": values,
+        "hole": 0.3,
+        "marker": {"colors": _AQ_COLORS},
+        "textinfo": "label+percent",
+        "textfont": {"size": 12},
+        "hovertemplate": '<b>%{label}</b><br>Value: %{value:.2f}<br>Percentage: %{percent}<extra></extra>'
+    }
+
+    layout = {
+        "title": {
             'text': f'Air Quality Composition - {city}',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 16}
         },
-        template='plotly_white',
-        height=400,
-        showlegend=True,
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.02
-        )
-    )
-    
+        "template": 'plotly_white',
+        "height": 400,
+        "showlegend": True,
+        "legend": _PIE_LEGEND
+    }
+
     return {
         "chart_type": "air_quality_pie",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
-def create_weather_distribution_pie_chart(weather_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
+def create_air_quality_pie_chart(components: Dict[str, float], city: str) -> Dict[str, Any]:
     """
-    Create a pie chart for weather condition distribution
+    Create a pie chart for air quality components
     """
-    # Count weather conditions
-    weather_counts = {}
-    for item in weather_data:
-        condition = item.get('weather', 'Unknown')
-        weather_counts[condition] = weather_counts.get(condition, 0) + 1
-    
+    return _air_quality_pie_chart(tuple(sorted(components.items())), city)
+
+@lru_cache(maxsize=128)
+def _weather_distribution_pie_chart(observed: tuple, city: str) -> Dict[str, Any]:
+    # Count weather conditions in one C-level pass
+    weather_counts = Counter(observed)
+
     # Create pie chart
     conditions = list(weather_counts.keys())
     counts = list(weather_counts.values())
-    
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#FFB6C1', '#98FB98']
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=conditions,
-        values=counts,
-        hole=0.3,
-        marker_colors=colors[:len(conditions)],
-        textinfo='label+percent',
-        textfont_size=12,
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title={
+
+    trace = {
+        "type": "pie",
+        "labels": conditions,
+        "values": counts,
+        "hole": 0.3,
+        "marker": {"colors": _WEATHER_COLORS[:len(conditions)].tolist()},
+        "textinfo": "label+percent",
+        "textfont": {"size": 12},
+        "hovertemplate": '<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    }
+
+    layout = {
+        "title": {
             'text': f'Weather Conditions Distribution - {city}',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 16}
         },
-        template='plotly_white',
-        height=400,
-        showlegend=True,
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.02
-        )
-    )
-    
+        "template": 'plotly_white',
+        "height": 400,
+        "showlegend": True,
+        "legend": _PIE_LEGEND
+    }
+
     return {
         "chart_type": "weather_distribution_pie",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "data": {"data": [trace], "layout": layout},
+        "layout": layout
     }
 
-def create_temperature_humidity_pie_chart(temperature_data: List[float], humidity_data: List[float], city: str) -> Dict[str, Any]:
+def create_weather_distribution_pie_chart(weather_data: List[Dict[str, Any]], city: str) -> Dict[str, Any]:
     """
-    Create a pie chart showing temperature and humidity ranges
+    Create a pie chart for weather condition distribution
     """
-    # Categorize temperature ranges
-    temp_ranges = ['Cold (<10°C)', 'Cool (10-20°C)', 'Warm (20-30°C)', 'Hot (>30°C)']
-    temp_counts = [0, 0, 0, 0]
-    
-    for temp in temperature_data:
-        if temp < 10:
-            temp_counts[0] += 1
-        elif temp < 20:
-            temp_counts[1] += 1
-        elif temp < 30:
-            temp_counts[2] += 1
-        else:
-            temp_counts[3] += 1
-    
-    # Categorize humidity ranges
-    humidity_ranges = ['Low (<40%)', 'Moderate (40-60%)', 'High (60-80%)', 'Very High (>80%)']
-    humidity_counts = [0, 0, 0, 0]
-    
-    for humidity in humidity_data:
-        if humidity < 40:
-            humidity_counts[0] += 1
-        elif humidity < 60:
-            humidity_counts[1] += 1
-        elif humidity < 80:
-            humidity_counts[2] += 1
-        else:
-            humidity_counts[3] += 1
-    
-    # Create subplot with two pie charts
-    from plotly.subplots import make_subplots
-    
-    fig = make_subplots(
-        rows=1, cols=2,
-        specs=[[{"type": "pie"}, {"type": "pie"}]],
-        subplot_titles=("Temperature Ranges", "Humidity Ranges")
+    observed = tuple(item.get('weather', 'Unknown') for item in weather_data)
+    return _weather_distribution_pie_chart(observed, city)
+
+@lru_cache(maxsize=128)
+def _temperature_humidity_pie_chart(temperature_data: tuple, humidity_data: tuple, city: str) -> Dict[str, Any]:
+    # Histogram both series in two C-level passes: _bin_right assigns each
+    # value its bin (matching the old strict-less-than ladders), bincount
+    # tallies the bins. Counts stay as ndarrays; chart_to_json /
+    # ORJSONResponse serialize them natively via OPT_SERIALIZE_NUMPY.
+    temp_counts = np.bincount(
+        _bin_right(temperature_data, _TEMP_HIST_EDGES), minlength=4
+    )
+
+    humidity_counts = np.bincount(
+        _bin_right(humidity_data, _HUMIDITY_HIST_EDGES), minlength=4
     )
-    
-    # Temperature pie chart
-    fig.add_trace(go.Pie(
-        labels=temp_ranges,
-        values=temp_counts,
-        hole=0.3,
-        marker_colors=['#87CEEB', '#4ECDC4', '#FFB347', '#FF6B6B'],
-        name="Temperature"
-    ), row=1, col=1)
-    
-    # Humidity pie chart
-    fig.add_trace(go.Pie(
-        labels=humidity_ranges,
-        values=humidity_counts,
-        hole=0.3,
-        marker_colors=['#E6E6FA', '#B0E0E6', '#87CEEB', '#4682B4'],
-        name="Humidity"
-    ), row=1, col=2)
-    
-    fig.update_layout(
-        title={
+
+    # Two side-by-side pies via explicit domains (what make_subplots would
+    # generate, minus the subplot machinery)
+    temp_trace = {
+        "type": "pie",
+        "labels": _TEMP_RANGES,
+        "values": temp_counts,
+        "hole": 0.3,
+        "marker": {"colors": _TEMP_RANGE_COLORS},
+        "name": "Temperature",
+        "domain": {"x": [0.0, 0.45], "y": [0.0, 1.0]}
+    }
+
+    humidity_trace = {
+        "type": "pie",
+        "labels": _HUMIDITY_RANGES,
+        "values": humidity_counts,
+        "hole": 0.3,
+        "marker": {"colors": _HUMIDITY_RANGE_COLORS},
+        "name": "Humidity",
+        "domain": {"x": [0.55, 1.0], "y": [0.0, 1.0]}
+    }
+
+    layout = {
+        "title": {
             'text': f'Temperature & Humidity Distribution - {city}',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 16}
         },
-        template='plotly_white',
-        height=400,
-        showlegend=False
-    )
-    
+        "annotations": [
+            {
+                "text": "Temperature Ranges",
+                "x": 0.225, "y": 1.0,
+                "xref": "paper", "yref": "paper",
+                "xanchor": "center", "yanchor": "bottom",
+                "showarrow": False,
+                "font": {"size": 16}
+            },
+            {
+                "text": "Humidity Ranges",
+                "x": 0.775, "y": 1.0,
+                "xref": "paper", "yref": "paper",
+                "xanchor": "center", "yanchor": "bottom",
+                "showarrow": False,
+                "font": {"size": 16}
+            }
+        ],
+        "template": 'plotly_white',
+        "height": 400,
+        "showlegend": False
+    }
+
     return {
         "chart_type": "temperature_humidity_pie",
-        "data": fig.to_dict(),
-        "layout": fig.layout.to_dict()
+        "data": {"data": [temp_trace, humidity_trace], "layout": layout},
+        "layout": layout
     }
+
+def create_temperature_humidity_pie_chart(temperature_data: List[float], humidity_data: List[float], city: str) -> Dict[str, Any]:
+    """
+    Create a pie chart showing temperature and humidity ranges
+    """
+    return _temperature_humidity_pie_chart(tuple(temperature_data), tuple(humidity_data), city)